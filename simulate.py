@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+# Headless simulator for the same rules as blackjack.py (single fresh 52-card deck
+# per round, dealer stands on all 17s, no blackjack bonus). It does not import
+# blackjack.py, because that module opens a fullscreen Pygame window on import.
+# Unlike the game it needs numpy (see requirements.txt): pip install -r requirements.txt
+
+# Card values in a 52-card deck: 2-10, jack/queen/king count as 10, ace as 11
+DECK = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * 4, dtype=np.int8)
+
+# Player actions (first decision of the hand)
+STAND, HIT, DOUBLE = 0, 1, 2
+ACTIONS = {"stand": STAND, "hit": HIT, "double": DOUBLE}
+
+# Columns written for every hand, with their on-disk types
+COLUMNS = {
+    "upcard": np.int8,        # Dealer's visible card, 2-11 (11 = ace)
+    "player_total": np.int8,  # Player total after the first two cards
+    "soft": np.bool_,         # Initial player total counts an ace as 11
+    "action": np.int8,        # STAND, HIT or DOUBLE
+    "player_final": np.int8,  # Player total at the end of the round
+    "dealer_final": np.int8,  # Dealer total at the end of the round
+    "payout": np.int8,        # Net result in base bets (-2 to +2)
+}
+
+# Index keys are (upcard, player_total): upcard 2-11, initial total 4-21
+MIN_UPCARD, MAX_UPCARD = 2, 11
+MIN_TOTAL, MAX_TOTAL = 4, 21
+TOTAL_SLOTS = 22
+N_KEYS = 12 * TOTAL_SLOTS
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+MANIFEST = "manifest.json"
+INDEX_COLUMNS = ["upcard", "player_total"]
+
+
+def index_key(upcard, player_total):
+    """Map an (upcard, player total) pair to its slot in the chunk index."""
+    return upcard * TOTAL_SLOTS + player_total
+
+
+def check_state(upcard, player_total):
+    """Raise ValueError for a state that has no slot in the index."""
+    if not MIN_UPCARD <= upcard <= MAX_UPCARD:
+        raise ValueError(f"Upcard must be between {MIN_UPCARD} and {MAX_UPCARD}, got {upcard}")
+    if not MIN_TOTAL <= player_total <= MAX_TOTAL:
+        raise ValueError(f"Player total must be between {MIN_TOTAL} and {MAX_TOTAL}, got {player_total}")
+
+
+class Hands:
+    """A batch of hands being played in parallel, one row per hand."""
+    def __init__(self, n):
+        self.hard = np.zeros(n, dtype=np.int16)  # Total with aces counted as 1
+        self.has_ace = np.zeros(n, dtype=np.bool_)
+
+    def add_cards(self, values, mask=None):
+        """Add one card per row (only where mask is set)."""
+        if mask is not None:
+            values = np.where(mask, values, 0)
+        self.hard += np.where(values == 11, 1, values)
+        self.has_ace |= values == 11
+
+    @property
+    def soft(self):
+        """Rows where an ace can be counted as 11 without busting."""
+        return self.has_ace & (self.hard + 10 <= 21)
+
+    @property
+    def total(self):
+        """Best total of each hand, like PlayerHand.total_value."""
+        return np.where(self.soft, self.hard + 10, self.hard)
+
+
+def simulate_chunk(n, rng):
+    """Play n rounds and return their columns as a dict of arrays."""
+    rows = np.arange(n)
+    cards = rng.permuted(np.tile(DECK, (n, 1)), axis=1)
+    position = np.full(n, 4)
+
+    def draw(mask):
+        values = cards[rows, position]
+        position[mask] += 1
+        return values
+
+    # Deal like BlackjackGame: player, dealer, player, dealer
+    player = Hands(n)
+    dealer = Hands(n)
+    player.add_cards(cards[:, 0])
+    player.add_cards(cards[:, 2])
+    dealer.add_cards(cards[:, 1])
+    dealer.add_cards(cards[:, 3])
+
+    upcard = cards[:, 1]
+    player_total = player.total
+    soft = player.soft
+
+    # Choose the first action uniformly so every (state, action) cell gets samples.
+    # After a hit the player keeps hitting below 17; a double takes exactly one card.
+    action = rng.integers(0, len(ACTIONS), size=n).astype(np.int8)
+    first = action != STAND
+    player.add_cards(draw(first), first)
+    while True:
+        hitting = (action == HIT) & (player.total < 17)
+        if not hitting.any():
+            break
+        player.add_cards(draw(hitting), hitting)
+
+    player_final = player.total
+    player_bust = player_final > 21
+
+    # Dealer hits until reaching 17 or higher
+    while True:
+        hitting = dealer.total < 17
+        if not hitting.any():
+            break
+        dealer.add_cards(draw(hitting), hitting)
+
+    dealer_final = dealer.total
+    dealer_bust = dealer_final > 21
+
+    result = np.where(player_bust, -1,
+             np.where(dealer_bust | (player_final > dealer_final), 1,
+             np.where(player_final == dealer_final, 0, -1)))
+    payout = result * np.where(action == DOUBLE, 2, 1)
+
+    columns = {
+        "upcard": upcard,
+        "player_total": player_total,
+        "soft": soft,
+        "action": action,
+        "player_final": player_final,
+        "dealer_final": dealer_final,
+        "payout": payout,
+    }
+    return {name: columns[name].astype(dtype) for name, dtype in COLUMNS.items()}
+
+
+def write_chunk(path, columns):
+    """Sort a chunk by (upcard, player total) and save it with its index."""
+    keys = index_key(columns["upcard"].astype(np.int16), columns["player_total"])
+    order = np.argsort(keys, kind="stable")
+    os.makedirs(path, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(path, f"{name}.npy"), values[order])
+
+    # offsets[k]:offsets[k + 1] is the row range of index key k
+    offsets = np.searchsorted(keys[order], np.arange(N_KEYS + 1)).astype(np.int64)
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+
+
+def simulate_to_disk(out_dir, total_hands, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """Simulate total_hands rounds and write them as chunked columnar files."""
+    if chunk_size <= 0:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+    if total_hands < 0:
+        raise ValueError(f"Number of hands cannot be negative, got {total_hands}")
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    chunks = []
+    remaining = total_hands
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        name = f"chunk_{len(chunks):05d}"
+        write_chunk(os.path.join(out_dir, name), simulate_chunk(n, rng))
+        chunks.append({"name": name, "rows": n})
+        remaining -= n
+
+    manifest = {
+        "columns": {name: np.dtype(dtype).str for name, dtype in COLUMNS.items()},
+        "index": INDEX_COLUMNS,
+        "total_slots": TOTAL_SLOTS,
+        "chunks": chunks,
+    }
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class HandDataset:
+    """Memory-mapped view of a simulated dataset written by simulate_to_disk."""
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self.check_manifest()
+        self.columns = list(self.manifest["columns"])
+
+    def check_manifest(self):
+        """Raise ValueError if the dataset was written with a different layout."""
+        expected = {name: np.dtype(dtype).str for name, dtype in COLUMNS.items()}
+        if self.manifest.get("columns") != expected:
+            raise ValueError(f"Dataset columns {self.manifest.get('columns')} do not match {expected}")
+        if self.manifest.get("index") != INDEX_COLUMNS:
+            raise ValueError(f"Dataset is indexed by {self.manifest.get('index')}, expected {INDEX_COLUMNS}")
+        if self.manifest.get("total_slots") != TOTAL_SLOTS:
+            raise ValueError(f"Dataset uses {self.manifest.get('total_slots')} total slots, expected {TOTAL_SLOTS}")
+
+    def __len__(self):
+        return sum(chunk["rows"] for chunk in self.manifest["chunks"])
+
+    def _load(self, chunk, name):
+        """Open one column of a chunk without reading it into memory."""
+        values = np.load(os.path.join(self.path, chunk["name"], f"{name}.npy"), mmap_mode="r")
+        expected = self.manifest["columns"].get(name, np.dtype(np.int64).str)  # offsets are int64
+        if values.dtype.str != expected:
+            raise ValueError(f"{chunk['name']}/{name}.npy has dtype {values.dtype.str}, expected {expected}")
+        return values
+
+    def select(self, upcard, player_total, columns=None):
+        """Return an iterator of per-chunk column slices for one (upcard, player total) cell."""
+        check_state(upcard, player_total)
+        return self._select(index_key(upcard, player_total), columns or self.columns)
+
+    def _select(self, key, columns):
+        """Yield the rows of one index key from every chunk."""
+        for chunk in self.manifest["chunks"]:
+            offsets = self._load(chunk, "offsets")
+            if len(offsets) != N_KEYS + 1:
+                raise ValueError(f"{chunk['name']}/offsets.npy has {len(offsets)} entries, expected {N_KEYS + 1}")
+            start, stop = int(offsets[key]), int(offsets[key + 1])
+            if start == stop:
+                continue
+            yield {name: self._load(chunk, name)[start:stop] for name in columns}
+
+    def ev(self, upcard, player_total, action, soft=None):
+        """Average payout per base bet of an action in one state, plus the sample count."""
+        action = ACTIONS[action] if isinstance(action, str) else action
+        total_payout = 0
+        count = 0
+        for part in self.select(upcard, player_total, ["soft", "action", "payout"]):
+            mask = part["action"] == action
+            if soft is not None:
+                mask &= part["soft"] == soft
+            total_payout += int(part["payout"][mask].sum(dtype=np.int64))
+            count += int(mask.sum())
+        return (total_payout / count if count else float("nan")), count
+
+
+def int_in_range(low, high=None):
+    """Build an argparse type that accepts integers from low to high (inclusive)."""
+    def parse(value):
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+        if number < low or (high is not None and number > high):
+            bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+            raise argparse.ArgumentTypeError(f"must be {bounds}, got {number}")
+        return number
+    return parse
+
+
+def parse_upcard(value):
+    """Accept 2-11 or a card name like 'ace'/'king' for the dealer upcard."""
+    names = {"ace": 11, "a": 11, "jack": 10, "queen": 10, "king": 10}
+    if value.lower() in names:
+        return names[value.lower()]
+    return int_in_range(MIN_UPCARD, MAX_UPCARD)(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless blackjack simulation and analysis.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Simulate hands and write them to disk.")
+    run_parser.add_argument("out_dir")
+    run_parser.add_argument("--hands", type=int_in_range(1), default=DEFAULT_CHUNK_SIZE)
+    run_parser.add_argument("--chunk-size", type=int_in_range(1), default=DEFAULT_CHUNK_SIZE)
+    run_parser.add_argument("--seed", type=int, default=None)
+
+    ev_parser = subparsers.add_parser("ev", help="Expected value of an action in one state.")
+    ev_parser.add_argument("data_dir")
+    ev_parser.add_argument("--upcard", type=parse_upcard, required=True)
+    ev_parser.add_argument("--total", type=int_in_range(MIN_TOTAL, MAX_TOTAL), required=True)
+    ev_parser.add_argument("--action", choices=list(ACTIONS), required=True)
+    ev_parser.add_argument("--soft", choices=["yes", "no"], default=None)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        manifest = simulate_to_disk(args.out_dir, args.hands, args.chunk_size, args.seed)
+        print(f"Wrote {args.hands} hands in {len(manifest['chunks'])} chunks to {args.out_dir}")
+    else:
+        soft = None if args.soft is None else args.soft == "yes"
+        ev, count = HandDataset(args.data_dir).ev(args.upcard, args.total, args.action, soft)
+        print(f"EV of {args.action} on {args.total} vs {args.upcard}: {ev:+.4f} ({count} hands)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pytest
+
+import simulate
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    simulate.simulate_to_disk(tmp_path, 5000, chunk_size=1500, seed=7)
+    return simulate.HandDataset(tmp_path)
+
+
+def concatenated(dataset):
+    """Load every chunk of a dataset into one array per column."""
+    chunks = dataset.manifest["chunks"]
+    return {name: np.concatenate([dataset._load(chunk, name) for chunk in chunks])
+            for name in dataset.columns}
+
+
+def test_select_matches_brute_force_mask(dataset):
+    columns = concatenated(dataset)
+    assert len(columns["upcard"]) == len(dataset) == 5000
+    for upcard in range(simulate.MIN_UPCARD, simulate.MAX_UPCARD + 1):
+        for total in range(simulate.MIN_TOTAL, simulate.MAX_TOTAL + 1):
+            mask = (columns["upcard"] == upcard) & (columns["player_total"] == total)
+            parts = list(dataset.select(upcard, total))
+            for name in dataset.columns:
+                selected = np.concatenate([part[name] for part in parts]) if parts else np.array([])
+                assert np.array_equal(selected, columns[name][mask])
+
+
+def test_ev_matches_brute_force_mean(dataset):
+    columns = concatenated(dataset)
+    mask = ((columns["upcard"] == 10) & (columns["player_total"] == 20)
+            & (columns["action"] == simulate.STAND))
+    ev, count = dataset.ev(10, 20, "stand")
+    assert count == mask.sum()
+    assert ev == pytest.approx(columns["payout"][mask].mean())
+
+
+def test_columns_are_consistent(dataset):
+    columns = concatenated(dataset)
+    payout = columns["payout"]
+    doubled = columns["action"] == simulate.DOUBLE
+    player_bust = columns["player_final"] > 21
+    dealer_bust = columns["dealer_final"] > 21
+
+    assert set(np.abs(payout[doubled])) <= {0, 2}
+    assert set(np.abs(payout[~doubled])) <= {0, 1}
+    # A player bust loses even when the dealer busts too
+    assert (payout[player_bust] < 0).all()
+    assert (payout[~player_bust & dealer_bust] > 0).all()
+    assert (columns["player_final"][columns["action"] == simulate.STAND]
+            == columns["player_total"][columns["action"] == simulate.STAND]).all()
+    assert (columns["dealer_final"] >= 17).all()
+
+
+def test_soft_ace_becomes_hard():
+    hands = simulate.Hands(1)
+    hands.add_cards(np.array([11]))
+    hands.add_cards(np.array([6]))
+    assert hands.total[0] == 17 and hands.soft[0]
+    hands.add_cards(np.array([10]))
+    assert hands.total[0] == 17 and not hands.soft[0]
+
+
+def test_two_aces_count_as_twelve():
+    hands = simulate.Hands(1)
+    hands.add_cards(np.array([11]))
+    hands.add_cards(np.array([11]))
+    assert hands.total[0] == 12 and hands.soft[0]
+
+
+def test_masked_rows_are_unchanged():
+    hands = simulate.Hands(2)
+    hands.add_cards(np.array([5, 5]))
+    hands.add_cards(np.array([9, 9]), np.array([True, False]))
+    assert list(hands.total) == [14, 5]
+
+
+@pytest.mark.parametrize("upcard, total", [(10, 30), (12, 21), (1, 16), (10, 3)])
+def test_select_rejects_states_outside_index(dataset, upcard, total):
+    with pytest.raises(ValueError):
+        dataset.select(upcard, total)
+    with pytest.raises(ValueError):
+        dataset.ev(upcard, total, "stand")
+
+
+@pytest.mark.parametrize("hands, chunk_size", [(10, 0), (10, -1), (-1, 10)])
+def test_simulate_rejects_bad_sizes(tmp_path, hands, chunk_size):
+    with pytest.raises(ValueError):
+        simulate.simulate_to_disk(tmp_path, hands, chunk_size)
+
+
+def test_mismatched_manifest_is_rejected(dataset, tmp_path):
+    path = os.path.join(tmp_path, simulate.MANIFEST)
+    with open(path) as f:
+        manifest = json.load(f)
+    manifest["total_slots"] = simulate.TOTAL_SLOTS + 1
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError):
+        simulate.HandDataset(tmp_path)
+
+
+@pytest.mark.parametrize("value", ["12", "1", "foo", "joker"])
+def test_parse_upcard_rejects_bad_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        simulate.parse_upcard(value)